@@ -1,21 +1,22 @@
 from __future__ import annotations
 
 import asyncio
-from re import Match
+import datetime
+import time
 from typing import TYPE_CHECKING, TypedDict, Any
 
 import asyncpg
 import discord
 from aiohttp import web
+from discord.ext import tasks
 from discord.ext.duck import webserver
 from discord.ui.item import Item
 
-from config import PORT
+import config
 
-from .notes import notify_text
+from .notes import ViewNotes, notify_text
 
 if TYPE_CHECKING:
-    from .notes import Notes
     from main import TagsBot
 
 
@@ -25,21 +26,9 @@ class InHelpPayload(TypedDict):
     owner_id: int
 
 
-class ViewNotes(discord.ui.DynamicItem, template=r"NOTES:(?P<id>\d+)"):
-    def __init__(self, user_id: int):
-        self.user_id = user_id
-        super().__init__(discord.ui.Button(label='View Notes', custom_id=f"NOTES:{user_id}"))
-
-    @classmethod
-    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: Match[str]):
-        return cls(int(match.group('id')))
-
-    async def callback(self, interaction: discord.Interaction[TagsBot]):
-        cog: Notes | None = interaction.client.get_cog('Notes')  # type: ignore
-        if not cog:
-            return await interaction.response.send_message("Service currently unavailable.", ephemeral=True)
-        user = await interaction.client.fetch_user(self.user_id)
-        await cog.get_notes_impl(interaction, user)
+# How long until a watcher can be notified about the same thread again.
+# Entries older than this are also pruned from the `warned` table.
+RENOTIFY_INTERVAL = datetime.timedelta(seconds=getattr(config, 'RENOTIFY_INTERVAL', 60 * 60 * 24 * 30))
 
 
 class ToggleNotifications(discord.ui.DynamicItem, template="NOTIFS_TOGGLE"):
@@ -58,19 +47,60 @@ class ToggleNotifications(discord.ui.DynamicItem, template="NOTIFS_TOGGLE"):
         return cls()
 
 class NotificationView(discord.ui.View):
-    def __init__(self, user_id: int):
+    def __init__(self, user_id: int, note_count: int):
         super().__init__(timeout=None)
         self.add_item(ToggleNotifications())
-        self.add_item(ViewNotes(user_id))
+        self.add_item(ViewNotes(user_id, label=f'View Notes ({note_count})'))
 
 
-class DpyListener(webserver.WebserverCog, port=PORT):
+class DpyListener(webserver.WebserverCog, port=config.PORT):
     def __init__(self, bot: TagsBot):
         super().__init__()
         self.bot = bot
         self.message_processing_lock = asyncio.Lock()
         self.bot.add_dynamic_items(ToggleNotifications, ViewNotes)
 
+    async def cog_load(self) -> None:
+        start = time.perf_counter()
+        await super().cog_load()
+        self.bot.startup_timings['webserver bind'] = time.perf_counter() - start
+        self.compact_warned.start()
+
+    async def cog_unload(self) -> None:
+        self.compact_warned.cancel()
+        await super().cog_unload()
+
+    @tasks.loop(hours=1)
+    async def compact_warned(self):
+        """Prunes warned entries that are past the re-notify interval."""
+        query = "DELETE FROM warned WHERE created_at < NOW() - $1::interval"
+        try:
+            status = await self.bot.pool.execute(query, RENOTIFY_INTERVAL)
+        except (asyncpg.PostgresError, OSError, asyncio.TimeoutError) as e:
+            self.logger.warning("Could not compact warned table, retrying next run", exc_info=e)
+        else:
+            self.logger.debug("Compacted warned table: %s", status)
+
+    async def send_notification(
+        self, conn: asyncpg.pool.PoolConnectionProxy, user_id: int, dm_channel_id: int | None, **kwargs: Any
+    ) -> discord.Message:
+        """DMs a user, using their stored DM channel so that it's usually a single request."""
+        if dm_channel_id is not None:
+            channel = self.bot.get_partial_messageable(dm_channel_id, type=discord.ChannelType.private)
+            try:
+                return await channel.send(**kwargs)
+            except discord.NotFound:
+                self.logger.debug("Stored DM channel %s for %s is stale, refreshing", dm_channel_id, user_id)
+            # A Forbidden here means closed DMs or a block, which a new DM channel won't fix, so it propagates.
+
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        dm_channel = await user.create_dm()
+        if dm_channel.id != dm_channel_id:
+            query = """INSERT INTO user_settings (user_id, dm_channel_id) VALUES ($1, $2)
+                        ON CONFLICT (user_id) DO UPDATE SET dm_channel_id = EXCLUDED.dm_channel_id"""
+            await conn.execute(query, user_id, dm_channel.id)
+        return await dm_channel.send(**kwargs)
+
     @webserver.route('post', '/inhelp')
     async def on_dpy_help_thread_interact(self, request: web.Request):
         """https://github.com/DuckBot-Discord/DuckBot/tree/master/cogs/dpy_help.py"""
@@ -87,11 +117,17 @@ class DpyListener(webserver.WebserverCog, port=PORT):
                     if not whitelisted and not is_owner:
                         return web.json_response({'error': 'user not whitelisted'})
 
-                    query = "SELECT COALESCE((SELECT notifications_enabled FROM user_settings WHERE user_id = $1), TRUE)"
-                    notifications_enabled = await conn.fetchval(query, data['user_id'])
-                    if not notifications_enabled:
+                    query = "SELECT notifications_enabled, dm_channel_id FROM user_settings WHERE user_id = $1"
+                    settings = await conn.fetchrow(query, data['user_id'])
+                    if settings and settings['notifications_enabled'] is False:
                         return web.json_response({'error': 'notifications disabled'})
 
+                    # Cheap rejection for the common case, before looking at muted notes.
+                    query = "SELECT count FROM note_counts WHERE target_id = $1"
+                    note_count: int | None = await conn.fetchval(query, data['owner_id'])
+                    if not note_count:
+                        return web.json_response({'error': 'user has no notes'})
+
                     query = """
                         SELECT EXISTS (
                             SELECT 1 FROM user_notes WHERE target_id = $1 AND NOT EXISTS (
@@ -107,21 +143,25 @@ class DpyListener(webserver.WebserverCog, port=PORT):
                     if not has_notes:
                         return web.json_response({'error': 'user has no notes'})
 
+                    # Only (re-)warn if there is no entry within the re-notify interval.
+                    query = """
+                        INSERT INTO warned (user_id, thread_id, created_at) VALUES ($1, $2, NOW())
+                        ON CONFLICT (user_id, thread_id) DO UPDATE SET created_at = NOW()
+                        WHERE warned.created_at < NOW() - $3::interval
+                        RETURNING TRUE
+                    """
+                    should_warn = await conn.fetchval(query, data['user_id'], data['thread_id'], RENOTIFY_INTERVAL)
+                    if not should_warn:
+                        return web.json_response({'error': 'already warned'})
+
                     try:
-                        await conn.execute(
-                            "INSERT INTO warned(user_id, thread_id) VALUES ($1, $2)",
+                        await self.send_notification(
+                            conn,
                             data['user_id'],
-                            data['thread_id'],
+                            settings['dm_channel_id'] if settings else None,
+                            content=f"Hey! User <@{data['owner_id']}> has notes set! From https://discord.com/channels/336642139381301249/{data['thread_id']}",
+                            view=NotificationView(data['owner_id'], note_count),
                         )
-
-                        user = await self.bot.fetch_user(data['user_id'])
-                        await user.send(
-                            f"Hey! User <@{data['owner_id']}> has notes set! From https://discord.com/channels/336642139381301249/{data['thread_id']}",
-                            view=NotificationView(data['owner_id']),
-                        )
-
-                    except asyncpg.UniqueViolationError:
-                        pass
                     except discord.HTTPException:
                         pass
             return web.json_response({'status': 'ok'})
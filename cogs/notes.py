@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import re
+import time
+from re import Match
 from textwrap import indent
 from typing import TYPE_CHECKING
 
@@ -48,12 +51,40 @@ GET_NOTES_FROM_USER = """
 """
 
 
+USER_ID_REGEX = re.compile(r'<@!?(\d{15,19})>|(\d{15,19})')
+NOTE_ID_REGEX = re.compile(r'(\d{1,19})')
+BIGINT_MAX = 2**63 - 1
+# Users with more notes than this start in the overview instead of the detailed view.
+OVERVIEW_THRESHOLD = 3
+
+
 def notify_text(text: str, value: bool):
     return NOTIFICATIONS_EMOJI[value] + (text % TOGGLE_TEXT[value])
 
 
+class ViewNotes(discord.ui.DynamicItem, template=r"NOTES:(?P<id>\d+)"):
+    def __init__(self, user_id: int, label: str = 'View Notes'):
+        self.user_id = user_id
+        super().__init__(discord.ui.Button(label=label, custom_id=f"NOTES:{user_id}"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match: Match[str]):
+        return cls(int(match.group('id')))
+
+    async def callback(self, interaction: discord.Interaction[TagsBot]):
+        await show_notes_for(interaction, self.user_id)
+
+
+async def show_notes_for(interaction: discord.Interaction[TagsBot], user_id: int):
+    cog: Notes | None = interaction.client.get_cog('Notes')  # type: ignore
+    if not cog:
+        return await interaction.response.send_message("Service currently unavailable.", ephemeral=True)
+    user = await interaction.client.fetch_user(user_id)
+    await cog.get_notes_impl(interaction, user)
+
+
 class NotesMenu(ViewMenuPages):
-    source: NotesFormatter
+    source: NotesFormatter | NotesOverviewFormatter
 
     @property
     def current_data(self):
@@ -86,36 +117,70 @@ class NotesMenu(ViewMenuPages):
                 FROM user_notes WHERE id = $1"""
 
             new_data = await conn.fetchrow(sql, self.current_data['id'], interaction.user.id)
-            self.source.entries[self.current_page] = new_data or self.source.entries[self.current_page]
-            await self.show_checked_page(interaction, self.current_page)
-            await interaction.followup.send(
-                notify_text("You will %s get notified for that note.", not self.current_data['muted']), ephemeral=True
-            )
+
+        await self.bot.mark_write(interaction.user)
+        self.source.entries[self.current_page] = new_data or self.source.entries[self.current_page]
+        await self.show_checked_page(interaction, self.current_page)
+        await interaction.followup.send(
+            notify_text("You will %s get notified for that note.", not self.current_data['muted']), ephemeral=True
+        )
 
     @discord.ui.button(emoji='\N{WASTEBASKET}')
     async def delete_note(self, interaction: discord.Interaction, button: discord.ui.Button):
         query = "DELETE FROM user_notes WHERE id = $1 AND user_id = $2"
-        await self.bot.pool.execute(query, self.current_data['id'], interaction.user.id)
+        status = await self.bot.pool.execute(query, self.current_data['id'], interaction.user.id)
+        if status != 'DELETE 0':
+            await self.bot.mark_write(interaction.user)
         data = await self.bot.pool.fetch(GET_NOTES_FROM_USER, self.current_data['target_id'], interaction.user.id)
         self.update_source(NotesFormatter(data))
         await self.show_checked_page(interaction, self.current_page)
 
+    @discord.ui.button(label='Overview')
+    async def go_to_overview(self, interaction: discord.Interaction, button: discord.ui.Button):
+        index = self.current_page
+        self.update_source(NotesOverviewFormatter(self.source.entries))
+        await self.show_checked_page(interaction, index // self.source.per_page)
+
+    @discord.ui.select(placeholder='Open a note...')
+    async def open_note(self, interaction: discord.Interaction, select: discord.ui.Select):
+        self.update_source(NotesFormatter(self.source.entries))
+        await self.show_checked_page(interaction, int(select.values[0]))
+
     def _update_labels(self, page_number: int) -> None:
-        data = self.current_data
         super()._update_labels(page_number)
+        if self.source.per_page != 1:
+            start = page_number * self.source.per_page
+            self.open_note.options = [
+                discord.SelectOption(
+                    label=short(f"({record['id']}) {record['content']}", 100),
+                    value=str(index),
+                    emoji=NOTIFICATIONS_EMOJI[not record['muted']],
+                )
+                for index, record in enumerate(self.source.entries[start : start + self.source.per_page], start=start)
+            ]
+            return
+
+        data = self.current_data
         self.toggle_notifs_for_note.emoji = NOTIFICATIONS_EMOJI[data['muted']]
         self.delete_note.disabled = data['user_id'] != self.owner.id
 
     def fill_items(self) -> None:
         super().fill_items()
         self.remove_item(self.stop_pages)
+        if self.compact:
+            self.stop_pages.row = 2
         if self.source.per_page == 1:
             if self.compact:
-                self.stop_pages.row = 2
                 self.toggle_notifs_for_note.row = 2
                 self.delete_note.row = 2
+                self.go_to_overview.row = 2
             self.add_item(self.toggle_notifs_for_note)
             self.add_item(self.delete_note)
+            if len(self.source.entries) > 1:
+                self.add_item(self.go_to_overview)
+        else:
+            self.open_note.row = 1 if self.compact else 2
+            self.add_item(self.open_note)
         self.add_item(self.stop_pages)
 
 
@@ -143,6 +208,80 @@ class NotesFormatter(menus.ListPageSource):
         )
 
 
+class NotesOverviewFormatter(menus.ListPageSource):
+    def __init__(self, notes: list[Record]):
+        super().__init__(notes, per_page=10)
+
+    async def format_page(self, menu: ViewMenuPages, records: list[Record]):
+        start = menu.current_page * self.per_page
+        description = "\n".join(
+            f"`{index + 1}.` {NOTIFICATIONS_EMOJI[not record['muted']]} <@{record['user_id']}>: "
+            + short(record['content'].replace('\n', ' '), 150)
+            for index, record in enumerate(records, start=start)
+        )
+        return discord.Embed(
+            title=f"{len(self.entries)} notes",
+            description=f"Notes for <@{records[0]['target_id']}>\n\n{description}",
+            color=menu.bot.colour,
+        ).set_footer(text=f"Page {menu.current_page + 1}/{self.get_max_pages()}")
+
+
+class ScanFormatter(menus.ListPageSource):
+    def __init__(self, counts: list[Record], names: dict[int, str]):
+        super().__init__(counts, per_page=10)
+        self.names = names
+
+    async def format_page(self, menu: ViewMenuPages, records: list[Record]):
+        description = "\n".join(
+            f"<@{record['target_id']}> ({self.names[record['target_id']]}): {record['count']} note(s)" for record in records
+        )
+        return discord.Embed(title="Noted users", description=description, color=menu.bot.colour).set_footer(
+            text=f"{len(self.entries)} noted user(s) out of {len(self.names)} scanned"
+        )
+
+
+class ScanNotesButton(discord.ui.Button['ScanMenu']):
+    # Not a ViewNotes: dynamic items in a menu that gets stopped would unregister the
+    # bot-wide NOTES: handler used by the DM notifications.
+    def __init__(self, user_id: int, label: str, row: int):
+        super().__init__(label=label, row=row)
+        self.user_id = user_id
+
+    async def callback(self, interaction: discord.Interaction[TagsBot]):
+        await show_notes_for(interaction, self.user_id)
+
+
+class ScanMenu(ViewMenuPages):
+    source: ScanFormatter
+
+    def _update_labels(self, page_number: int) -> None:
+        super()._update_labels(page_number)
+        for item in self.children:
+            if isinstance(item, ScanNotesButton):
+                self.remove_item(item)
+
+        start = page_number * self.source.per_page
+        for index, record in enumerate(self.source.entries[start : start + self.source.per_page]):
+            label = short(self.source.names[record['target_id']], 80)
+            self.add_item(ScanNotesButton(record['target_id'], label=label, row=1 + index // 5))
+
+
+def parse_ids(text: str, pattern: re.Pattern[str]) -> tuple[set[int], int]:
+    """Parses a pasted list of IDs, returns the valid IDs and how many tokens were skipped."""
+    ids: set[int] = set()
+    skipped = 0
+    for token in re.split(r'[\s,]+', text):
+        if not token:
+            continue
+        match = pattern.fullmatch(token)
+        value = int(next(group for group in match.groups() if group)) if match else 0
+        if 0 < value <= BIGINT_MAX:
+            ids.add(value)
+        else:
+            skipped += 1
+    return ids, skipped
+
+
 def short(text: str, length: int):
     """Shortens a bit of text with ellipses."""
     if len(text) > length:
@@ -151,6 +290,28 @@ def short(text: str, length: int):
         return text
 
 
+class ConfirmView(discord.ui.View):
+    def __init__(self, owner: discord.abc.User):
+        super().__init__(timeout=60)
+        self.owner = owner
+        self.value: bool | None = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user == self.owner
+
+    @discord.ui.button(label='Confirm', style=discord.ButtonStyle.red)
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.value = True
+        await interaction.response.defer()
+        self.stop()
+
+    @discord.ui.button(label='Cancel', style=discord.ButtonStyle.grey)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.value = False
+        await interaction.response.defer()
+        self.stop()
+
+
 class AddNoteModal(discord.ui.Modal):
     content = discord.ui.TextInput(
         label='',
@@ -168,7 +329,8 @@ class AddNoteModal(discord.ui.Modal):
         async with interaction.client.safe_connection() as conn:
             query = "INSERT INTO user_notes (user_id, target_id, content, created_at) VALUES ($1, $2, $3, $4)"
             await conn.execute(query, self.owner.id, self.target.id, self.content.value, interaction.created_at)
-            await interaction.response.send_message("\N{WHITE HEAVY CHECK MARK}", ephemeral=True, delete_after=1)
+        await interaction.client.mark_write(interaction.user)
+        await interaction.response.send_message("\N{WHITE HEAVY CHECK MARK}", ephemeral=True, delete_after=1)
 
 
 class Notes(commands.Cog):
@@ -198,10 +360,11 @@ class Notes(commands.Cog):
         self.bot.tree.remove_command(self.add_ctx_menu.name, type=self.add_ctx_menu.type)
 
     async def get_notes_impl(self, interaction: discord.Interaction[TagsBot], user: discord.User):
-        data = await self.bot.pool.fetch(GET_NOTES_FROM_USER, user.id, interaction.user.id)
+        data = await self.bot.read_pool_for(interaction.user).fetch(GET_NOTES_FROM_USER, user.id, interaction.user.id)
         if not data:
             return await interaction.response.send_message("No notes found...", ephemeral=True, delete_after=5)
-        await NotesMenu(NotesFormatter(data), interaction=interaction, compact=True).start()
+        source = NotesOverviewFormatter(data) if len(data) > OVERVIEW_THRESHOLD else NotesFormatter(data)
+        await NotesMenu(source, interaction=interaction, compact=True).start()
 
     async def add_note_impl(self, interaction: discord.Interaction, user: discord.User):
         await interaction.response.send_modal(AddNoteModal(interaction.user, user))
@@ -245,23 +408,172 @@ class Notes(commands.Cog):
         async with self.bot.safe_connection() as conn:
             query = "DELETE FROM user_notes WHERE id = $1 AND (user_id = $2 OR $3 = TRUE) returning content"
             content = await conn.fetchval(query, note_id, interaction.user.id, await self.bot.is_owner(interaction.user))
-            if content is None:
-                await interaction.response.send_message("Could not delete note, are you sure it exists?", ephemeral=True)
-            else:
-                await interaction.response.send_message(
-                    "Successfully deleted the following quote:\n" + indent(content, '> '), ephemeral=True
-                )
+        if content is None:
+            await interaction.response.send_message("Could not delete note, are you sure it exists?", ephemeral=True)
+        else:
+            await self.bot.mark_write(interaction.user)
+            await interaction.response.send_message(
+                "Successfully deleted the following quote:\n" + indent(content, '> '), ephemeral=True
+            )
+
+    @notes.command(name='scan')
+    async def note_scan(
+        self,
+        interaction: discord.Interaction[TagsBot],
+        channel: discord.TextChannel | discord.VoiceChannel | discord.StageChannel | discord.Thread | None = None,
+        limit: app_commands.Range[int, 1, 1000] = 200,
+    ):
+        """Checks every member and recent author of a channel or thread for notes.
+
+        Parameters
+        ----------
+        channel: discord.abc.GuildChannel
+            The channel or thread to scan. Defaults to the current channel.
+        limit: int
+            How many recent messages to collect authors from.
+        """
+        channel = channel or interaction.channel  # type: ignore
+        if not isinstance(channel, (discord.TextChannel, discord.VoiceChannel, discord.StageChannel, discord.Thread)):
+            return await interaction.response.send_message("Could not scan this channel.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        names: dict[int, str] = {}
+        if isinstance(channel, (discord.VoiceChannel, discord.StageChannel)):
+            names.update((member.id, member.display_name) for member in channel.members)
+        elif isinstance(channel, discord.Thread):
+            for thread_member in channel.members:
+                member = channel.guild.get_member(thread_member.id)
+                names[thread_member.id] = member.display_name if member else str(thread_member.id)
+
+        try:
+            async for message in channel.history(limit=limit):
+                if not message.author.bot:
+                    names[message.author.id] = message.author.display_name
+        except discord.HTTPException:
+            pass
+
+        if not names:
+            return await interaction.followup.send("No members found...", ephemeral=True)
+
+        query = "SELECT target_id, count FROM note_counts WHERE target_id = ANY($1::BIGINT[]) ORDER BY count DESC"
+        data = await self.bot.read_pool_for(interaction.user).fetch(query, list(names))
+        if not data:
+            return await interaction.followup.send(f"None of the {len(names)} scanned users have notes.", ephemeral=True)
+        await ScanMenu(ScanFormatter(data, names), interaction=interaction, compact=True).start()
+
+    @notes.command(name='bulk-add')
+    async def note_bulk_add(
+        self,
+        interaction: discord.Interaction[TagsBot],
+        content: app_commands.Range[str, 1, 2000],
+        targets: str | None = None,
+        role: discord.Role | None = None,
+    ):
+        """Adds the same note to many users at once.
+
+        Parameters
+        ----------
+        content: str
+            The note to add to every target.
+        targets: str
+            A pasted list of user IDs or mentions.
+        role: discord.Role
+            Add the note to every member of this role.
+        """
+        target_ids, skipped = parse_ids(targets or '', USER_ID_REGEX)
+        if role:
+            target_ids.update(member.id for member in role.members)
+        if not target_ids:
+            return await interaction.response.send_message(f"No targets found... (skipped {skipped})", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        start = time.perf_counter()
+        async with self.bot.safe_connection() as conn:
+            query = """
+                INSERT INTO user_notes (user_id, target_id, content, created_at)
+                SELECT $1, target_id, $3, $4 FROM UNNEST($2::BIGINT[]) AS target_id
+            """
+            status = await conn.execute(query, interaction.user.id, list(target_ids), content, interaction.created_at)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        inserted = int(status.split()[-1])
+        if inserted:
+            await self.bot.mark_write(interaction.user)
+        await interaction.followup.send(
+            f"Added {inserted} notes in {elapsed:.2f}ms. Skipped {skipped} invalid targets.", ephemeral=True
+        )
+
+    @notes.command(name='bulk-remove')
+    @app_commands.rename(note_ids='note-ids')
+    async def note_bulk_remove(
+        self,
+        interaction: discord.Interaction[TagsBot],
+        author: discord.User | None = None,
+        note_ids: str | None = None,
+    ):
+        """Removes many notes at once, by author and/or by note ID.
+
+        Parameters
+        ----------
+        author: discord.User
+            Remove every note written by this user.
+        note_ids: str
+            A pasted list of note IDs to remove.
+        """
+        ids, skipped = parse_ids(note_ids or '', NOTE_ID_REGEX)
+        if note_ids and not ids:
+            return await interaction.response.send_message(f"No valid note IDs found (skipped {skipped}).", ephemeral=True)
+        if not author and not ids:
+            return await interaction.response.send_message("Pass an author or a list of note IDs.", ephemeral=True)
+
+        is_owner = await self.bot.is_owner(interaction.user)
+        if author and author != interaction.user and not is_owner:
+            return await interaction.response.send_message("You can only bulk remove your own notes.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        condition = """
+            WHERE ($1::BIGINT IS NULL OR user_id = $1)
+            AND (CARDINALITY($2::BIGINT[]) = 0 OR id = ANY($2::BIGINT[]))
+            AND (user_id = $3 OR $4 = TRUE)
+        """
+        args = (author and author.id, list(ids), interaction.user.id, is_owner)
+
+        count = await self.bot.pool.fetchval("SELECT COUNT(*) FROM user_notes" + condition, *args)
+        if not count:
+            return await interaction.followup.send(f"No matching notes found (skipped {skipped}).", ephemeral=True)
+
+        view = ConfirmView(interaction.user)
+        await interaction.followup.send(
+            f"This will permanently delete {count} notes. Skipped {skipped} invalid note IDs. Are you sure?",
+            view=view,
+            ephemeral=True,
+        )
+        await view.wait()
+        if not view.value:
+            return await interaction.edit_original_response(content="Cancelled.", view=None)
+
+        start = time.perf_counter()
+        async with self.bot.safe_connection() as conn:
+            status = await conn.execute("DELETE FROM user_notes" + condition, *args)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        deleted = int(status.split()[-1])
+        if deleted:
+            await self.bot.mark_write(interaction.user)
+        await interaction.edit_original_response(content=f"Removed {deleted} notes in {elapsed:.2f}ms.", view=None)
 
     @note_remove.autocomplete("note_id")
     async def note_id_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice]:
         if not interaction.namespace.user:
             return [app_commands.Choice(value=-1, name="No user provided...")]
+        pool = self.bot.read_pool_for(interaction.user)
         if await self.bot.is_owner(interaction.user):
             query = "SELECT id, content FROM user_notes WHERE target_id = $1"
-            data = await self.bot.pool.fetch(query, interaction.namespace.user.id)
+            data = await pool.fetch(query, interaction.namespace.user.id)
         else:
             query = "SELECT id, content FROM user_notes WHERE user_id = $1 and target_id = $2"
-            data = await self.bot.pool.fetch(query, interaction.user.id, interaction.namespace.user.id)
+            data = await pool.fetch(query, interaction.user.id, interaction.namespace.user.id)
 
         d = [app_commands.Choice(value=-1, name="No notes found...")]
         return [app_commands.Choice(name=short(f"({entry['id']}) {entry['content']}", 100), value=10) for entry in data] or d
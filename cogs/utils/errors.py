@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from typing import Any, Dict, List, Tuple
+
+import aiohttp
+import discord
+from discord.ext import commands, tasks
+from discord.ext.duck import errors
+
+
+__all__: Tuple[str, ...] = ("ErrorAggregator",)
+
+
+log = logging.getLogger('GlobalNotes.errors')
+
+Fingerprint = Tuple[str, str, int, str]
+
+
+def fingerprint(error: BaseException) -> Fingerprint:
+    """Identifies an error by its type and the place it was raised from."""
+    error = getattr(error, 'original', None) or error
+    frames = traceback.extract_tb(error.__traceback__)
+    if not frames:
+        return (type(error).__qualname__, '', 0, '')
+    frame = frames[-1]
+    return (type(error).__qualname__, frame.filename, frame.lineno or 0, frame.name)
+
+
+class ErrorAggregator:
+    """Sits in front of an :class:`ErrorManager` so that outages don't flood the error webhook.
+
+    The first occurrence of an error is forwarded immediately, as long as the
+    rate limit allows it, otherwise it is held back and forwarded once the
+    rate limit frees up. Repeats are counted and sent as a single summary
+    every ``interval`` seconds. Errors that stay quiet for a whole interval
+    are forgotten, so the next occurrence is forwarded immediately again.
+    """
+
+    def __init__(
+        self,
+        manager: errors.ErrorManager,
+        *,
+        webhook_url: str,
+        session: aiohttp.ClientSession,
+        interval: float = 60.0,
+        rate: int = 10,
+        per: float = 60.0,
+    ):
+        self.manager = manager
+        self.webhook = discord.Webhook.from_url(webhook_url, session=session)
+        self.cooldown = commands.Cooldown(rate, per)
+        # Errors that were forwarded, and how often they repeated since the last summary.
+        self._repeats: Dict[Fingerprint, int] = {}
+        # New errors held back by the rate limit: (error, ctx, repeats).
+        self._pending: Dict[Fingerprint, List[Any]] = {}
+        self.flush.change_interval(seconds=interval)
+
+    def start(self) -> None:
+        self.flush.start()
+
+    def stop(self) -> None:
+        self.flush.stop()
+
+    async def add_error(self, *, error: BaseException, ctx: Any = None) -> None:
+        key = fingerprint(error)
+        if key in self._repeats:
+            self._repeats[key] += 1
+        elif key in self._pending:
+            self._pending[key][2] += 1
+        elif self.cooldown.update_rate_limit():
+            self._pending[key] = [error, ctx, 0]
+        else:
+            self._repeats[key] = 0
+            await self.manager.add_error(error=error, ctx=ctx)
+
+    @tasks.loop(seconds=60)
+    async def flush(self) -> None:
+        lines: list[str] = []
+        for key, count in list(self._repeats.items()):
+            if not count:
+                del self._repeats[key]
+                continue
+            name, filename, lineno, function = key
+            lines.append(f"{count}x {name} at {filename}:{lineno} in {function}")
+            self._repeats[key] = 0
+
+        for key in list(self._pending):
+            if self.cooldown.update_rate_limit():
+                break
+            error, ctx, _ = self._pending.pop(key)
+            # Its earlier occurrences were already listed as not reported yet.
+            self._repeats[key] = 0
+            await self.manager.add_error(error=error, ctx=ctx)
+
+        for key, (_, _, count) in self._pending.items():
+            name, filename, lineno, function = key
+            lines.append(f"{count + 1}x {name} at {filename}:{lineno} in {function} (not reported yet)")
+
+        if not lines:
+            return
+
+        content = "Repeated errors in the last %d seconds:\n```\n%s\n```"
+        body = "\n".join(lines)
+        if len(body) > 1900:
+            body = body[:1897] + '...'
+        try:
+            await self.webhook.send(content % (self.flush.seconds, body))
+        except discord.HTTPException as e:
+            log.error("Could not send error summary", exc_info=e)
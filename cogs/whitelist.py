@@ -73,6 +73,24 @@ class WhitelistCog(commands.Cog):
         formatted = ", ".join(str(user) for user in ((ctx.bot.get_user(r['user_id']) or r['user_id']) for r in data))
         await ctx.send(formatted)
 
+    @notes.command(name='recount')
+    async def notes_recount(self, ctx: commands.Context):
+        """Rebuilds the per-user note counts, in case they drifted."""
+        async with self.bot.safe_connection() as conn:
+            await conn.execute("LOCK TABLE user_notes IN SHARE ROW EXCLUSIVE MODE")
+            query = """
+                SELECT COUNT(*) FROM note_counts
+                FULL JOIN (SELECT target_id, COUNT(*) AS count FROM user_notes GROUP BY target_id) AS actual
+                USING (target_id)
+                WHERE note_counts.count IS DISTINCT FROM actual.count
+            """
+            drifted = await conn.fetchval(query)
+            await conn.execute("DELETE FROM note_counts")
+            await conn.execute(
+                "INSERT INTO note_counts (target_id, count) SELECT target_id, COUNT(*) FROM user_notes GROUP BY target_id"
+            )
+        await ctx.send(f"Rebuilt note counts, {drifted} entries had drifted.")
+
 
 async def setup(bot: TagsBot):
     await bot.add_cog(WhitelistCog(bot))
@@ -1,26 +1,46 @@
 from __future__ import annotations
 
 import re
+import sys
+import time
 import logging
 import asyncio
 from contextlib import asynccontextmanager
+from typing import Any, Awaitable
 
 import aiohttp
 import asyncpg
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ext.duck import errors
 
 import config
+from cogs.utils.errors import ErrorAggregator
 
 
 EXTENSIONS = [
-    'jishaku',
     'cogs.notes',
     'cogs.whitelist',
     'cogs.dpy_help',
 ]
 
+# Can be overridden with `DEV_EXTENSIONS` in config.py, e.g. set it to [] in production.
+DEV_EXTENSIONS = [
+    'jishaku',
+]
+
+# Replica lag (in seconds) after which reads fall back to the primary. Can be overridden with
+# `REPLICA_MAX_LAG` in config.py.
+REPLICA_MAX_LAG = 5.0
+
+log = logging.getLogger('GlobalNotes')
+
+
+def parse_lsn(lsn: str) -> int:
+    """Converts a textual pg_lsn (e.g. ``16/B374D848``) into a comparable integer."""
+    high, low = lsn.split('/')
+    return (int(high, 16) << 32) | int(low, 16)
+
 
 class BotTree(discord.app_commands.CommandTree["TagsBot"]):
     async def on_error(
@@ -34,23 +54,37 @@ class BotTree(discord.app_commands.CommandTree["TagsBot"]):
 
 
 class TagsBot(commands.Bot):
-    def __init__(self, pool: asyncpg.Pool, session: aiohttp.ClientSession):
+    def __init__(self, pool: asyncpg.Pool, session: aiohttp.ClientSession, replica_dsn: str | None = None):
         super().__init__(
             intents=discord.Intents.all(),
             command_prefix="hey ",
             strip_after_prefix=True,
             activity=discord.Activity(name='hey help', type=discord.ActivityType.listening),
         )
-        self.errors = errors.ErrorManager(
-            bot=self,
+        self.errors = ErrorAggregator(
+            errors.ErrorManager(
+                bot=self,
+                webhook_url=config.WEBHOOK,
+                session=session,
+                # on_error and on_command_error are handled below, so they go through the aggregator.
+                hijack_bot_on_error=False,
+                on_command_error_settings=errors.CommandErrorSettings(
+                    hijack=False,
+                ),
+            ),
             webhook_url=config.WEBHOOK,
             session=session,
-            hijack_bot_on_error=True,
-            on_command_error_settings=errors.CommandErrorSettings(
-                hijack=True,
-            ),
         )
         self.pool = pool
+        self.replica_dsn = replica_dsn
+        self.replica_pool: asyncpg.Pool | None = None
+        self.replica_max_lag: float = getattr(config, 'REPLICA_MAX_LAG', REPLICA_MAX_LAG)
+        # Stays lagging until the first successful lag check.
+        self.replica_lagging = True
+        self.replica_replay_lsn: int | None = None
+        self._recent_writes: dict[int, int] = {}
+        self.startup_timings: dict[str, float] = {}
+        self._started_at = time.perf_counter()
 
     async def sync(self):
         context_types = [0, 1, 2]
@@ -67,9 +101,40 @@ class TagsBot(commands.Bot):
         data = await self.http.bulk_upsert_global_commands(app_info.id, payload=default_payload)
         print(data)
 
+    async def _timed(self, phase: str, coro: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.startup_timings[phase] = time.perf_counter() - start
+
     async def setup_hook(self) -> None:
-        for extension in EXTENSIONS:
-            await self.load_extension(extension)
+        extensions = [*EXTENSIONS, *getattr(config, 'DEV_EXTENSIONS', DEV_EXTENSIONS)]
+        *results, owner_result = await asyncio.gather(
+            *(self._timed(f'load {extension}', self.load_extension(extension)) for extension in extensions),
+            # is_owner fetches and caches the owner IDs, so the first /inhelp request doesn't have to.
+            self._timed('owner cache', self.is_owner(self.user)),  # type: ignore
+            return_exceptions=True,
+        )
+        for extension, result in zip(extensions, results):
+            if not isinstance(result, BaseException):
+                continue
+            if extension in EXTENSIONS:
+                raise result
+            log.error("Failed to load dev extension %s, skipping it", extension, exc_info=result)
+
+        if isinstance(owner_result, BaseException):
+            log.warning("Could not warm the owner cache", exc_info=owner_result)
+        if self.replica_dsn:
+            self.check_replica_lag.start()
+        self.errors.start()
+
+    async def on_ready(self) -> None:
+        if 'gateway ready' in self.startup_timings:
+            return
+        self.startup_timings['gateway ready'] = time.perf_counter() - self._started_at
+        timings = ", ".join(f"{phase}: {elapsed * 1000:.0f}ms" for phase, elapsed in self.startup_timings.items())
+        log.info("Startup timings: %s", timings)
 
     @asynccontextmanager
     async def safe_connection(self, *, timeout: float = 10.0):
@@ -78,6 +143,98 @@ class TagsBot(commands.Bot):
             async with connection.transaction():
                 yield connection
 
+    @property
+    def read_pool(self) -> asyncpg.Pool:
+        """The pool for read-only queries. This is the replica, unless there is none or it's lagging behind."""
+        if self.replica_pool is None or self.replica_lagging:
+            return self.pool
+        return self.replica_pool
+
+    def read_pool_for(self, user: discord.abc.Snowflake) -> asyncpg.Pool:
+        """Like :attr:`read_pool`, but uses the primary until the replica has replayed the user's last write."""
+        written_lsn = self._recent_writes.get(user.id)
+        if written_lsn is not None and (self.replica_replay_lsn is None or self.replica_replay_lsn < written_lsn):
+            return self.pool
+        return self.read_pool
+
+    async def mark_write(self, user: discord.abc.Snowflake) -> None:
+        """Marks that a user has committed a write, so they can read their own writes.
+
+        This must be called after the transaction has been committed.
+        """
+        if not self.replica_dsn:
+            return
+        lsn = await self.pool.fetchval("SELECT pg_current_wal_lsn()::text")
+        self._recent_writes[user.id] = parse_lsn(lsn)
+
+    @tasks.loop(seconds=5)
+    async def check_replica_lag(self):
+        if self.replica_pool is None:
+            try:
+                self.replica_pool = await asyncpg.create_pool(self.replica_dsn)
+            except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError) as e:
+                log.warning("Could not connect to the replica, reading from primary", exc_info=e)
+                return
+
+        query = """
+            SELECT
+                COALESCE(
+                    CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()) END,
+                    0
+                ) AS lag,
+                pg_last_wal_replay_lsn()::text AS replay_lsn,
+                pg_is_in_recovery() AS in_recovery
+        """
+        try:
+            record = await self.replica_pool.fetchrow(query, timeout=self.replica_max_lag)
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError) as e:
+            log.warning("Could not check replica lag", exc_info=e)
+            lag = float('inf')
+        else:
+            assert record is not None
+            if record['in_recovery']:
+                lag = float(record['lag'])
+                self.replica_replay_lsn = parse_lsn(record['replay_lsn'])
+            else:
+                # Not a standby, so it never receives our writes. Everything is read from the primary.
+                log.warning("PG_REPLICA_DSN does not point to a standby server")
+                lag = float('inf')
+                self.replica_replay_lsn = None
+                self._recent_writes.clear()
+
+        lagging = lag > self.replica_max_lag
+        if lagging != self.replica_lagging:
+            log.warning("Replica %s (lag: %.2fs)", "is lagging, reading from primary" if lagging else "caught up", lag)
+        self.replica_lagging = lagging
+
+        if self.replica_replay_lsn is not None:
+            for user_id, written_lsn in list(self._recent_writes.items()):
+                if written_lsn <= self.replica_replay_lsn:
+                    del self._recent_writes[user_id]
+
+    async def on_error(self, event_method: str, /, *args: Any, **kwargs: Any) -> None:
+        error = sys.exc_info()[1]
+        if error is None:
+            return
+        log.error("Ignoring exception in %s", event_method, exc_info=error)
+        await self.errors.add_error(error=error)
+
+    async def on_command_error(self, context: commands.Context, exception: commands.CommandError) -> None:
+        if isinstance(exception, commands.CommandNotFound):
+            return
+        if isinstance(exception, (commands.UserInputError, commands.CheckFailure)):
+            await context.send(str(exception))
+            return
+        await self.errors.add_error(error=exception, ctx=context)
+
+    async def close(self) -> None:
+        self.check_replica_lag.cancel()
+        self.errors.stop()
+        await super().close()
+        if self.replica_pool is not None:
+            await self.replica_pool.close()
+
     @property
     def colour(self):
         return discord.Colour.blurple()
@@ -87,12 +244,15 @@ class TagsBot(commands.Bot):
         discord.utils.setup_logging(level=log_level)
 
         async def runner():
-            async with (
-                asyncpg.create_pool(config.PG_DSN) as pool,
-                aiohttp.ClientSession() as session,
-                cls(pool, session) as bot,
-            ):
-                await bot.start(config.TOKEN)
+            start = time.perf_counter()
+            async with asyncpg.create_pool(config.PG_DSN) as pool:
+                pool_create = time.perf_counter() - start
+                async with (
+                    aiohttp.ClientSession() as session,
+                    cls(pool, session, getattr(config, 'PG_REPLICA_DSN', None)) as bot,
+                ):
+                    bot.startup_timings['pool create'] = pool_create
+                    await bot.start(config.TOKEN)
 
         asyncio.run(runner())
 
@@ -107,7 +267,5 @@ class TagsBot(commands.Bot):
 
 
 if __name__ == "__main__":
-    import sys
-
     debug = sys.argv[-1] == '--debug'
     TagsBot.run(log_level=logging.DEBUG if debug else logging.INFO)
@@ -9,6 +9,8 @@ CREATE TABLE IF NOT EXISTS user_notes (
     PRIMARY KEY (id)
 ); 
 
+CREATE INDEX IF NOT EXISTS user_notes_target_id_idx ON user_notes (target_id);
+
 CREATE TABLE IF NOT EXISTS whitelist(
     entity_id BIGINT PRIMARY KEY,
     is_user BOOLEAN DEFAULT TRUE
@@ -16,17 +18,60 @@ CREATE TABLE IF NOT EXISTS whitelist(
 
 CREATE TABLE IF NOT EXISTS user_settings(
     user_id BIGINT PRIMARY KEY,
-    notifications_enabled BOOLEAN DEFAULT TRUE
+    notifications_enabled BOOLEAN DEFAULT TRUE,
+    dm_channel_id BIGINT
 );
 
+ALTER TABLE user_settings ADD COLUMN IF NOT EXISTS dm_channel_id BIGINT;
+
 CREATE TABLE IF NOT EXISTS warned(
     user_id BIGINT,
     thread_id BIGINT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     PRIMARY KEY (user_id, thread_id)
 );
 
+ALTER TABLE warned ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS warned_created_at_idx ON warned (created_at);
+
 CREATE TABLE IF NOT EXISTS user_muted_notes(
     note_id BIGINT REFERENCES user_notes(id) ON DELETE CASCADE,
     user_id BIGINT,
     PRIMARY KEY (note_id, user_id)
-);
\ No newline at end of file
+);
+
+CREATE TABLE IF NOT EXISTS note_counts(
+    target_id BIGINT PRIMARY KEY,
+    count BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION note_counts_insert() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO note_counts (target_id, count)
+    SELECT target_id, COUNT(*) FROM new_rows GROUP BY target_id
+    ON CONFLICT (target_id) DO UPDATE SET count = note_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION note_counts_delete() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE note_counts SET count = note_counts.count - deleted.count
+    FROM (SELECT target_id, COUNT(*) AS count FROM old_rows GROUP BY target_id) AS deleted
+    WHERE note_counts.target_id = deleted.target_id;
+    DELETE FROM note_counts WHERE count <= 0 AND target_id IN (SELECT target_id FROM old_rows);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_notes_count_insert ON user_notes;
+CREATE TRIGGER user_notes_count_insert AFTER INSERT ON user_notes
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION note_counts_insert();
+
+DROP TRIGGER IF EXISTS user_notes_count_delete ON user_notes;
+CREATE TRIGGER user_notes_count_delete AFTER DELETE ON user_notes
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION note_counts_delete();
+
+INSERT INTO note_counts (target_id, count)
+SELECT target_id, COUNT(*) FROM user_notes GROUP BY target_id
+ON CONFLICT (target_id) DO NOTHING;